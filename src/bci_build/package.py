@@ -8,7 +8,7 @@ from dataclasses import dataclass, field
 from itertools import product
 import enum
 import os
-from typing import Callable, ClassVar, Dict, List, Literal, Optional, Union
+from typing import ClassVar, Dict, List, Literal, Optional, Union
 
 import aiofiles
 
@@ -159,6 +159,13 @@ class Replacement:
     ] = None
 
 
+async def _write_to_file(
+    dest: str, fname: str, contents: Union[str, bytes], mode: str = "w"
+) -> None:
+    async with aiofiles.open(os.path.join(dest, fname), mode) as f:
+        await f.write(contents)
+
+
 @dataclass
 class BaseContainerImage(abc.ABC):
     """Base class for all Base Container Images."""
@@ -372,16 +379,13 @@ class BaseContainerImage(abc.ABC):
             val = value if isinstance(value, str) else value[0]
             return f'        <{prefix} execute="{val}"/>'
         else:
-            return (
-                f"""        <{prefix} execute=\"{value[0]}\">
-"""
-                + "\n".join(
-                    (f'          <argument name="{arg}"/>' for arg in value[1:])
-                )
-                + f"""
+            arguments = "\n".join(
+                f'          <argument name="{arg}"/>' for arg in value[1:]
+            )
+            return f"""        <{prefix} execute="{value[0]}">
+{arguments}
         </{prefix}>
 """
-            )
 
     @property
     def entrypoint_kiwi(self) -> Optional[str]:
@@ -476,45 +480,28 @@ exit 0
 
         """
 
-        def create_pkg_filter_func(
-            pkg_type: PackageType,
-        ) -> Callable[[Union[str, Package]], bool]:
-            def pkg_filter_func(p: Union[str, Package]) -> bool:
-                if isinstance(p, str):
-                    return pkg_type == PackageType.IMAGE
-                return p.pkg_type == pkg_type
-
-            return pkg_filter_func
-
         PKG_TYPES = (
             PackageType.DELETE,
             PackageType.BOOTSTRAP,
             PackageType.IMAGE,
             PackageType.UNINSTALL,
         )
-        delete_packages, bootstrap_packages, image_packages, uninstall_packages = (
-            list(filter(create_pkg_filter_func(pkg_type), self.package_list))
-            for pkg_type in PKG_TYPES
-        )
-
-        res = ""
-        for (pkg_list, pkg_type) in zip(
-            (delete_packages, bootstrap_packages, image_packages, uninstall_packages),
-            PKG_TYPES,
-        ):
-            if len(pkg_list) > 0:
-                res += (
-                    f"""  <packages type="{pkg_type}">
-    """
-                    + """
-    """.join(
-                        f'<package name="{pkg}"/>' for pkg in pkg_list
-                    )
-                    + """
-  </packages>
-"""
-                )
-        return res
+        packages_by_type: Dict[PackageType, List[Union[str, Package]]] = {
+            pkg_type: [] for pkg_type in PKG_TYPES
+        }
+        for pkg in self.package_list:
+            packages_by_type[
+                pkg.pkg_type if isinstance(pkg, Package) else PackageType.IMAGE
+            ].append(pkg)
+
+        parts: List[str] = []
+        for pkg_type in PKG_TYPES:
+            pkg_list = packages_by_type[pkg_type]
+            if pkg_list:
+                parts.append(f'  <packages type="{pkg_type}">\n')
+                parts.extend(f'    <package name="{pkg}"/>\n' for pkg in pkg_list)
+                parts.append("  </packages>\n")
+        return "".join(parts)
 
     @property
     def env_lines(self) -> str:
@@ -529,17 +516,13 @@ exit 0
         """Environment variable settings for a kiwi build recipe."""
         if not self.env:
             return ""
-        return (
-            """        <environment>
-          """
-            + """
-          """.join(
-                f'<env name="{k}" value="{v}"/>' for k, v in self.env.items()
-            )
-            + """
+        env_entries = "\n".join(
+            f'          <env name="{k}" value="{v}"/>' for k, v in self.env.items()
+        )
+        return f"""        <environment>
+{env_entries}
         </environment>
 """
-        )
 
     @property
     @abc.abstractmethod
@@ -663,17 +646,12 @@ exit 0
         files = ["_service"]
         tasks = []
 
-        async def write_to_file(
-            fname: str, contents: Union[str, bytes], mode="w"
-        ) -> None:
-            async with aiofiles.open(os.path.join(dest, fname), mode) as f:
-                await f.write(contents)
-
         if self.build_recipe_type == BuildType.DOCKER:
             fname = "Dockerfile"
             tasks.append(
                 asyncio.ensure_future(
-                    write_to_file(
+                    _write_to_file(
+                        dest,
                         fname,
                         DOCKERFILE_TEMPLATE.render(
                             image=self, DOCKERFILE_RUN=DOCKERFILE_RUN
@@ -687,14 +665,16 @@ exit 0
             fname = f"{self.package_name}.kiwi"
             tasks.append(
                 asyncio.ensure_future(
-                    write_to_file(fname, KIWI_TEMPLATE.render(image=self))
+                    _write_to_file(dest, fname, KIWI_TEMPLATE.render(image=self))
                 )
             )
             files.append(fname)
 
             if self.config_sh:
                 tasks.append(
-                    asyncio.ensure_future(write_to_file("config.sh", self.config_sh))
+                    asyncio.ensure_future(
+                        _write_to_file(dest, "config.sh", self.config_sh)
+                    )
                 )
                 files.append("config.sh")
 
@@ -705,20 +685,24 @@ exit 0
 
         tasks.append(
             asyncio.ensure_future(
-                write_to_file("_service", SERVICE_TEMPLATE.render(image=self))
+                _write_to_file(dest, "_service", SERVICE_TEMPLATE.render(image=self))
             )
         )
 
         changes_file_name = self.package_name + ".changes"
         changes_file_dest = os.path.join(dest, changes_file_name)
         if not os.path.exists(changes_file_dest):
-            tasks.append(asyncio.ensure_future(write_to_file(changes_file_name, "")))
+            tasks.append(
+                asyncio.ensure_future(_write_to_file(dest, changes_file_name, ""))
+            )
             files.append(changes_file_name)
 
         for fname, contents in self.extra_files.items():
             mode = "w" if isinstance(contents, str) else "bw"
             files.append(fname)
-            tasks.append(asyncio.ensure_future(write_to_file(fname, contents, mode)))
+            tasks.append(
+                asyncio.ensure_future(_write_to_file(dest, fname, contents, mode))
+            )
 
         await asyncio.gather(*tasks)
 
@@ -1678,22 +1662,17 @@ if __name__ == "__main__":
     parser.add_argument(
         "image",
         type=str,
-        nargs=1,
         choices=SORTED_CONTAINER_IMAGE_NAMES,
         help="The BCI container image, which package contents should be written to the disk",
     )
     parser.add_argument(
         "destination",
         type=str,
-        nargs=1,
         help="destination folder to which the files should be written",
     )
 
     args = parser.parse_args()
 
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(
-        ALL_CONTAINER_IMAGE_NAMES[args.image[0]].write_files_to_folder(
-            args.destination[0]
-        )
+    asyncio.run(
+        ALL_CONTAINER_IMAGE_NAMES[args.image].write_files_to_folder(args.destination)
     )
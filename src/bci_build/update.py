@@ -2,7 +2,8 @@
 import asyncio
 from dataclasses import dataclass, field
 import logging
-from typing import List, Literal, Optional
+import sys
+from typing import List, Literal, Optional, Tuple
 
 from bci_build.package import (
     ALL_CONTAINER_IMAGE_NAMES,
@@ -87,29 +88,34 @@ async def update_package(
 if __name__ == "__main__":
     import argparse
 
+    def _positive_int(value: str) -> int:
+        number = int(value)
+        if number < 1:
+            raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+        return number
+
     parser = argparse.ArgumentParser(
         "Update the SLE BCI image description on OBS or IBS"
     )
 
-    parser.add_argument(
+    image_selection = parser.add_mutually_exclusive_group(required=True)
+    image_selection.add_argument(
         "--images",
         type=str,
-        nargs="*",
+        nargs="+",
         choices=SORTED_CONTAINER_IMAGE_NAMES,
         help="The BCI container image that should be updated. This option is mutually exclusive with --service-pack.",
     )
-    parser.add_argument(
+    image_selection.add_argument(
         "--service-pack",
         type=str,
         choices=[str(v) for v in ALL_OS_VERSIONS],
-        nargs=1,
         help="Do not update a single image, instead update all images of a single service pack. This option is mutually exclusive with supplying image names.",
     )
     parser.add_argument(
         "--commit-msg",
         type=str,
-        nargs=1,
-        default=[None],
+        required=True,
         help="Required commit message that will be added to the changelog, as the commit message and for the submit request.",
     )
 
@@ -135,6 +141,13 @@ if __name__ == "__main__":
         default=None,
         help="Don't branch into the default project, use the supplied one instead.",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=_positive_int,
+        default=1,
+        help="Maximum number of images that are updated concurrently (defaults to 1). If an update fails, no further updates are started, but the ones that are already running are finished.",
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -145,52 +158,67 @@ if __name__ == "__main__":
     parser.add_argument(
         "--build-service-target",
         type=str,
-        nargs=1,
-        default=["obs"],
+        default="obs",
         choices=["obs", "ibs"],
         help="Specify whether the updater should target obs (build.opensuse.org) or ibs (build.suse.de)",
     )
 
     args = parser.parse_args()
 
-    handler = logging.StreamHandler()
-    handler.setFormatter(logging.Formatter(fmt="%(levelname)s: %(message)s"))
-    LOGGER.addHandler(handler)
-
-    if args.images and args.service_pack:
-        raise ValueError(
-            "Cannot set the service pack and specific images at the same time"
-        )
-
-    commit_msg = args.commit_msg[0]
-    if commit_msg is None:
-        raise ValueError("A commit message must be provided")
+    logging.basicConfig(format="%(levelname)s: %(message)s", force=True)
 
     if args.verbose > 0:
         LOGGER.setLevel((3 - min(args.verbose, 2)) * 10)
     else:
         LOGGER.setLevel("ERROR")
 
-    loop = asyncio.get_event_loop()
     images: List[str] = (
         args.images
         if args.images
         else [
             k
             for k, v in ALL_CONTAINER_IMAGE_NAMES.items()
-            if str(v.os_version) == args.service_pack[0]
+            if str(v.os_version) == args.service_pack
         ]
     )
 
-    for img in images:
-        loop.run_until_complete(
-            update_package(
-                ALL_CONTAINER_IMAGE_NAMES[img],
-                commit_msg=commit_msg,
-                target_prj=args.target_prj,
-                cleanup_on_error=args.cleanup_on_error,
-                submit_package=not args.no_sr,
-                cleanup_on_no_change=not args.no_cleanup_on_no_change,
-                build_service_target=args.build_service_target[0],
+    async def _update_images() -> Tuple[List[str], List[str]]:
+        sem = asyncio.Semaphore(args.jobs)
+        failed_images: List[str] = []
+        skipped_images: List[str] = []
+
+        async def _update_image(img: str) -> None:
+            async with sem:
+                # don't start new updates once one failed, but let the ones
+                # that are already running finish or clean up after themselves
+                if failed_images:
+                    LOGGER.debug("Not updating %s, a previous update failed", img)
+                    skipped_images.append(img)
+                    return
+                try:
+                    await update_package(
+                        ALL_CONTAINER_IMAGE_NAMES[img],
+                        commit_msg=args.commit_msg,
+                        target_prj=args.target_prj,
+                        cleanup_on_error=args.cleanup_on_error,
+                        submit_package=not args.no_sr,
+                        cleanup_on_no_change=not args.no_cleanup_on_no_change,
+                        build_service_target=args.build_service_target,
+                    )
+                except Exception:
+                    LOGGER.exception("Failed to update %s", img)
+                    failed_images.append(img)
+
+        await asyncio.gather(*(_update_image(img) for img in images))
+        return failed_images, skipped_images
+
+    failed_images, skipped_images = asyncio.run(_update_images())
+    if failed_images:
+        sys.exit(
+            f"Failed to update: {', '.join(failed_images)}"
+            + (
+                f"; not attempted: {', '.join(skipped_images)}"
+                if skipped_images
+                else ""
             )
         )
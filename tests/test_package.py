@@ -1,3 +1,6 @@
+from bci_build.package import Package, PackageType
+
+
 def test_entrypoint_docker_none(bci):
     cls, kwargs = bci
     c = cls(entrypoint=None, **kwargs)
@@ -46,3 +49,33 @@ def test_entrypoint_kiwi_list(bci):
         </entrypoint>
 """
     )
+
+
+def test_kiwi_packages_grouped_by_type(bci):
+    cls, kwargs = bci
+    kwargs["package_list"] = [
+        "cat",
+        Package("rpm", pkg_type=PackageType.DELETE),
+        Package("coreutils", pkg_type=PackageType.BOOTSTRAP),
+        Package("zypper", pkg_type=PackageType.UNINSTALL),
+        Package("sed"),
+    ]
+    c = cls(**kwargs)
+
+    assert (
+        c.kiwi_packages
+        == """  <packages type="delete">
+    <package name="rpm"/>
+  </packages>
+  <packages type="bootstrap">
+    <package name="coreutils"/>
+  </packages>
+  <packages type="image">
+    <package name="cat"/>
+    <package name="sed"/>
+  </packages>
+  <packages type="uninstall">
+    <package name="zypper"/>
+  </packages>
+"""
+    )